@@ -0,0 +1,72 @@
+import os
+import sys
+import time
+
+from columnarExport import FORCE_COLUMNS, TIME_COLUMN, ColumnarRecording, export_csv
+
+# Builds a data_converted.csv-shaped file of the requested size by repeating the real
+# recording, then compares the analyst workflow (pd.read_csv + per-trial stats) with
+# the same questions answered from the columnar export.
+
+def make_scaled_csv(source="data_converted.csv", out_path="data_converted_10000000.csv", rows=10_000_000):
+    import numpy as np
+    import pandas as pd
+
+    base = pd.read_csv(source)
+    span = int(base[TIME_COLUMN].max() - base[TIME_COLUMN].min()) + int(base["Step_ms"].median())
+    written = 0
+    repeat = 0
+    with open(out_path, "w", newline="") as f:
+        f.write(",".join(base.columns) + "\n")
+        while written < rows:
+            part = base.iloc[: rows - written].copy()
+            part["Index"] = np.arange(written, written + len(part))
+            part[TIME_COLUMN] += repeat * span
+            part.to_csv(f, header=False, index=False)
+            written += len(part)
+            repeat += 1
+    print(f"Wrote {written} rows to {out_path}")
+    return out_path
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<45} {time.perf_counter() - start:8.3f} s")
+    return result
+
+def count_rows(csv_path):
+    with open(csv_path, "rb") as f:
+        return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b"")) - 1
+
+def main(rows=10_000_000, csv_path=None):
+    import pandas as pd
+
+    if csv_path is None:
+        csv_path = f"data_converted_{rows}.csv"
+    # Only reuse a previous scaled file if it really has the requested size
+    if not os.path.exists(csv_path) or count_rows(csv_path) != rows:
+        make_scaled_csv(out_path=csv_path, rows=rows)
+    cols_path = timed("export to columnar (one-off)", lambda: export_csv(csv_path))
+
+    df = timed("pd.read_csv", lambda: pd.read_csv(csv_path))
+    t0, t1 = df[TIME_COLUMN].quantile([0.40, 0.45])
+
+    def pandas_trial():
+        trial = df[(df[TIME_COLUMN] >= t0) & (df[TIME_COLUMN] <= t1)]
+        return trial[FORCE_COLUMNS].mean(), trial[FORCE_COLUMNS].max()
+
+    def pandas_threshold():
+        return df.loc[df["V4"] > df["V4"].quantile(0.999), ["Index", "V4"]]
+
+    timed("pandas: trial mean/peak (after read_csv)", pandas_trial)
+    timed("pandas: V4 threshold rows (after read_csv)", pandas_threshold)
+    threshold = df["V4"].quantile(0.999)
+    del df
+
+    rec = timed("columnar: open", lambda: ColumnarRecording(cols_path))
+    timed("columnar: trial mean/peak", lambda: rec.summary(t0, t1, impulse=False))
+    timed("columnar: trial mean/peak/impulse", lambda: rec.summary(t0, t1))
+    timed("columnar: V4 threshold rows", lambda: rec.above("V4", threshold, ["Index", "V4"]))
+
+if __name__ == "__main__":
+    main(rows=int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
@@ -0,0 +1,56 @@
+import csv
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+# Cold-start of each subcommand = fresh interpreter + wiiboard dispatch + the imports
+# the subcommand needs before it starts touching the device or the data.
+SUBCOMMANDS = {
+    "record": "import readAndSAveInCsv, numpy, serial",
+    "raw": "import rawValueReading, serial",
+    "live": "import readAndObserveRealTime, numpy, serial, matplotlib.pyplot",
+    "plot": "import plotData, numpy, pandas, matplotlib.pyplot, scipy.signal, scipy.stats",
+    "calibrate": "import calibration, numpy, matplotlib.pyplot",
+    "export": "import columnarExport, numpy, pandas",
+    "query": "import columnarExport, numpy",
+    "analyze": "import spectralAnalysis, numpy, pandas, scipy.signal",
+}
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def time_command(cmd, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(cmd, cwd=HERE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        if result.returncode != 0:
+            return None  # e.g. a dependency is missing; a failed import is not a start-up time
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def fmt(ms):
+    return "failed" if ms is None else f"{ms:.1f} ms"
+
+def main(runs=5, out_path="startup_times.csv"):
+    stamp = datetime.now().isoformat(timespec="seconds")
+    rows = []
+    for name, imports in SUBCOMMANDS.items():
+        help_ms = time_command([sys.executable, "wiiboard.py", name, "--help"], runs)
+        ready_ms = time_command([sys.executable, "-c", f"import wiiboard; {imports}"], runs)
+        print(f"{name:<10} --help: {fmt(help_ms):>10}   ready: {fmt(ready_ms):>10}")
+        rows.append([stamp, name] + ["" if ms is None else round(ms, 1) for ms in (help_ms, ready_ms)])
+
+    # Append so the history of startup times is kept between runs
+    new_file = not os.path.exists(out_path)
+    with open(out_path, "a", newline="") as f:
+        writer = csv.writer(f)
+        if new_file:
+            writer.writerow(["Timestamp", "Subcommand", "Help_ms", "Ready_ms"])
+        writer.writerows(rows)
+    print(f"Startup times appended to {out_path}")
+
+if __name__ == "__main__":
+    main(runs=int(sys.argv[1]) if len(sys.argv) > 1 else 5)
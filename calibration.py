@@ -1,81 +1,91 @@
-import serial
-import re
-import time
-import threading
-import csv
-import glob
-import sys
-import statistics
-import numpy as np
-from collections import deque
 import os
 import csv
 import re
-import numpy as np
-from collections import deque
-import matplotlib.pyplot as plt  # Optional: comment out if not plotting
+
+CALIBRATION_DIR = "calibrationWeights"
 
 # --- Load calibration functions ---
-calibration_dir = "calibrationWeights"
-conversion_functions = {}
-
-for filename in os.listdir(calibration_dir):
-    match = re.search(r'(V\d)', filename)
-    if not match:
-        continue
-
-    sensor = match.group(1)
-    forces = []
-    raw_means = []
-
-    filepath = os.path.join(calibration_dir, filename)
-    with open(filepath, newline='') as f:
-        reader = csv.reader(f)
-        header = next(reader)
-        for row in reader:
-            try:
-                force_N = float(row[0])
-                raw_val = float(row[1])
-                forces.append(force_N)
-                raw_means.append(raw_val)
-            except:
-                print(f" Skipping invalid row in {filename}: {row}")
-                continue
-
-    if not any(f == 0.0 for f in forces):
-        print(f" WARNING: No 0 N baseline in {filename}. This will cause offset errors.")
-
-    # Fit linear model
-    coeffs = np.polyfit(raw_means, forces, 1)
-    slope, intercept = coeffs
-    conversion_functions[sensor] = (slope, intercept)
-
-    # Intercept sanity check
-    if abs(intercept) > 5:
-        print(f" {sensor}: Intercept = {intercept:.2f} N — possible calibration issue.")
-
-    print(f"{sensor} calibration: Force_N = {slope:.4f} * Raw + {intercept:.4f}")
-
-    # --- Optional: plot for visual check
-    try:
-        fit = np.poly1d(coeffs)
-        x = np.array(raw_means)
-        y = np.array(forces)
-        x_fit = np.linspace(min(x), max(x), 100)
-        y_fit = fit(x_fit)
-
-        plt.plot(x, y, 'o', label=f'{sensor} data')
-        plt.plot(x_fit, y_fit, '-', label=f'{sensor} fit')
-        plt.xlabel("Raw Value")
-        plt.ylabel("Force (N)")
-        plt.title(f"{sensor} Calibration Fit")
-        plt.grid(True)
-        plt.legend()
-    except Exception as e:
-        print(f"Could not plot {sensor}: {e}")
-
-# Show all sensor plots in one window
-plt.show()
+def load_calibration(calibration_dir=CALIBRATION_DIR):
+    import numpy as np
+
+    conversion_functions = {}
+    calibration_points = {}
+
+    for filename in os.listdir(calibration_dir):
+        match = re.search(r'(V\d)', filename)
+        if not match:
+            continue
+
+        sensor = match.group(1)
+        forces = []
+        raw_means = []
+
+        filepath = os.path.join(calibration_dir, filename)
+        with open(filepath, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            for row in reader:
+                try:
+                    force_N = float(row[0])
+                    raw_val = float(row[1])
+                    forces.append(force_N)
+                    raw_means.append(raw_val)
+                except:
+                    print(f" Skipping invalid row in {filename}: {row}")
+                    continue
+
+        if not any(f == 0.0 for f in forces):
+            print(f" WARNING: No 0 N baseline in {filename}. This will cause offset errors.")
+
+        # Fit linear model
+        coeffs = np.polyfit(raw_means, forces, 1)
+        slope, intercept = coeffs
+        conversion_functions[sensor] = (slope, intercept)
+        calibration_points[sensor] = (raw_means, forces)
+
+        # Intercept sanity check
+        if abs(intercept) > 5:
+            print(f" {sensor}: Intercept = {intercept:.2f} N — possible calibration issue.")
+
+        print(f"{sensor} calibration: Force_N = {slope:.4f} * Raw + {intercept:.4f}")
+
+    return conversion_functions, calibration_points
+
+# --- Optional: plot for visual check
+def plot_calibration(conversion_functions, calibration_points):
+    import numpy as np
+    import matplotlib.pyplot as plt
+
+    for sensor, coeffs in conversion_functions.items():
+        raw_means, forces = calibration_points[sensor]
+        try:
+            fit = np.poly1d(coeffs)
+            x = np.array(raw_means)
+            y = np.array(forces)
+            x_fit = np.linspace(min(x), max(x), 100)
+            y_fit = fit(x_fit)
+
+            plt.plot(x, y, 'o', label=f'{sensor} data')
+            plt.plot(x_fit, y_fit, '-', label=f'{sensor} fit')
+            plt.xlabel("Raw Value")
+            plt.ylabel("Force (N)")
+            plt.title(f"{sensor} Calibration Fit")
+            plt.grid(True)
+            plt.legend()
+        except Exception as e:
+            print(f"Could not plot {sensor}: {e}")
+
+    # Show all sensor plots in one window
+    plt.show()
+
+def main(calibration_dir=CALIBRATION_DIR, plot=True):
+    conversion_functions, calibration_points = load_calibration(calibration_dir)
+    if plot:
+        plot_calibration(conversion_functions, calibration_points)
+    return conversion_functions
+
+if __name__ == "__main__":
+    main()
 
 
 
@@ -0,0 +1,208 @@
+import json
+import os
+
+# --- Columnar layout ---
+# <name>.cols/
+#   meta.json          columns, dtypes, row count, rows per block
+#   <column>.bin       raw little-endian values of one column, read back with np.memmap
+#   stats.npz          per-block <column>_min/_max/_mean/_count and block_start/block_rows
+# Queries use the block stats to skip blocks, and only map the columns they need.
+
+BLOCK_ROWS = 65536
+FORCE_COLUMNS = ["V1", "V2", "V3", "V4"]
+TIME_COLUMN = "DeviceTime_ms"
+# Only these may be stored as integers; everything else (V1–V4 included) is float64 so
+# empty cells stay NaN and fractional values are never truncated
+INTEGER_COLUMNS = ["Index", "DeviceTime_ms", "Step_ms"]
+
+def default_output_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".cols"
+
+def _block_stats(values, block_rows):
+    import numpy as np
+
+    n_blocks = -(-len(values) // block_rows)
+    pad = n_blocks * block_rows - len(values)
+    blocks = np.concatenate([values.astype(np.float64), np.full(pad, np.nan)]).reshape(n_blocks, block_rows)
+    count = np.count_nonzero(~np.isnan(blocks), axis=1)
+    filled = count > 0
+    mins = np.full(n_blocks, np.nan)
+    maxs = np.full(n_blocks, np.nan)
+    means = np.full(n_blocks, np.nan)
+    mins[filled] = np.nanmin(blocks[filled], axis=1)
+    maxs[filled] = np.nanmax(blocks[filled], axis=1)
+    means[filled] = np.nansum(blocks[filled], axis=1) / count[filled]
+    return mins, maxs, means, count
+
+# --- CSV -> columnar export ---
+def export_csv(csv_path, out_path=None, block_rows=BLOCK_ROWS, blocks_per_chunk=16):
+    import numpy as np
+    import pandas as pd
+
+    if out_path is None:
+        out_path = default_output_path(csv_path)
+    os.makedirs(out_path, exist_ok=True)
+
+    columns = None
+    dtypes = {}
+    files = {}
+    stats = {}
+    n_rows = 0
+
+    # Chunks are a whole number of blocks, so every block (except the last) is full
+    try:
+        for chunk in pd.read_csv(csv_path, chunksize=block_rows * blocks_per_chunk):
+            if columns is None:
+                columns = list(chunk.columns)
+                for c in columns:
+                    integer = c in INTEGER_COLUMNS and pd.api.types.is_integer_dtype(chunk[c])
+                    dtypes[c] = "<i8" if integer else "<f8"
+                    files[c] = open(os.path.join(out_path, f"{c}.bin"), "wb")
+                    stats[c] = ([], [], [], [])
+
+            for c in columns:
+                if dtypes[c] == "<i8" and not pd.api.types.is_integer_dtype(chunk[c]):
+                    raise ValueError(f"{csv_path}: column {c} has empty or non-integer values after row {n_rows}")
+                values = chunk[c].to_numpy(dtype=dtypes[c])
+                values.tofile(files[c])
+                for acc, part in zip(stats[c], _block_stats(values, block_rows)):
+                    acc.append(part)
+            n_rows += len(chunk)
+    finally:
+        for f in files.values():
+            f.close()
+
+    if columns is None:
+        raise ValueError(f"{csv_path} has no rows to export")
+
+    block_start = np.arange(0, n_rows, block_rows)
+    arrays = {
+        "block_start": block_start,
+        "block_rows": np.minimum(block_rows, n_rows - block_start),
+    }
+    for c in columns:
+        for suffix, parts in zip(("min", "max", "mean", "count"), stats[c]):
+            arrays[f"{c}_{suffix}"] = np.concatenate(parts)
+    np.savez(os.path.join(out_path, "stats.npz"), **arrays)
+
+    with open(os.path.join(out_path, "meta.json"), "w") as f:
+        json.dump({"columns": columns, "dtypes": dtypes, "rows": n_rows, "block_rows": block_rows}, f, indent=2)
+
+    print(f"Exported {n_rows} rows ({len(block_start)} blocks) to {out_path}")
+    return out_path
+
+# --- Query helper ---
+class ColumnarRecording:
+    def __init__(self, path):
+        import numpy as np
+
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        self.columns = meta["columns"]
+        self.dtypes = meta["dtypes"]
+        self.rows = meta["rows"]
+        self.block_rows = meta["block_rows"]
+        with np.load(os.path.join(path, "stats.npz")) as npz:
+            self.stats = {k: npz[k] for k in npz.files}
+        self._maps = {}
+
+    def column(self, name):
+        """Memory-mapped view of a whole column; nothing is read until it is sliced."""
+        import numpy as np
+
+        if name not in self.dtypes:
+            raise KeyError(f"Unknown column {name!r}, available: {self.columns}")
+        if name not in self._maps:
+            self._maps[name] = np.memmap(os.path.join(self.path, f"{name}.bin"),
+                                         dtype=self.dtypes[name], mode="r", shape=(self.rows,))
+        return self._maps[name]
+
+    def _load(self, names, blocks):
+        import numpy as np
+
+        out = {}
+        for name in names:
+            col = self.column(name)
+            out[name] = np.concatenate(
+                [col[s:s + n] for s, n in zip(self.stats["block_start"][blocks], self.stats["block_rows"][blocks])]
+            ) if len(blocks) else np.empty(0, dtype=self.dtypes[name])
+        return out
+
+    def _blocks_overlapping(self, column, low, high):
+        import numpy as np
+
+        keep = self._mask(self.stats[f"{column}_max"], low, None) & self._mask(self.stats[f"{column}_min"], None, high)
+        return np.flatnonzero(keep)
+
+    def _mask(self, values, low, high):
+        import numpy as np
+
+        mask = np.ones(len(values), dtype=bool)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return mask
+
+    def time_range(self, columns=None, start=None, stop=None, time_column=TIME_COLUMN):
+        """Rows with start <= time_column <= stop, reading only overlapping blocks of the given columns."""
+        columns = list(columns or self.columns)
+        blocks = self._blocks_overlapping(time_column, start, stop)
+        data = self._load(dict.fromkeys(columns + [time_column]), blocks)
+        mask = self._mask(data[time_column], start, stop)
+        return {c: data[c][mask] for c in columns}
+
+    def above(self, column, threshold, columns=None):
+        """Rows where column > threshold, skipping blocks whose max is not above the threshold."""
+        import numpy as np
+
+        columns = list(columns or self.columns)
+        blocks = np.flatnonzero(self.stats[f"{column}_max"] > threshold)
+        data = self._load(dict.fromkeys(columns + [column]), blocks)
+        mask = data[column] > threshold
+        return {c: data[c][mask] for c in columns}
+
+    def summary(self, start=None, stop=None, columns=FORCE_COLUMNS, time_column=TIME_COLUMN, impulse=True):
+        """Per-trial mean, peak and (optionally) impulse in N·s of each force column.
+
+        Blocks that lie entirely inside [start, stop] contribute their stored mean and max;
+        only the blocks straddling the edges are read. Impulse is a trapezoid over device
+        time and needs the samples, so it reads every overlapping block of those columns.
+        """
+        import numpy as np
+
+        columns = list(columns)
+        blocks = self._blocks_overlapping(time_column, start, stop)
+        inside = self._mask(self.stats[f"{time_column}_min"][blocks], start, None) & \
+                 self._mask(self.stats[f"{time_column}_max"][blocks], None, stop)
+        full, edge = blocks[inside], blocks[~inside]
+
+        edge_data = self._load(columns + [time_column], edge)
+        edge_mask = self._mask(edge_data[time_column], start, stop)
+
+        result = {}
+        for c in columns:
+            count = self.stats[f"{c}_count"][full]
+            values = edge_data[c][edge_mask]
+            values = values[~np.isnan(values)]
+            total = count.sum() + len(values)
+            weighted = (np.nan_to_num(self.stats[f"{c}_mean"][full]) * count).sum() + values.sum()
+            peaks = np.concatenate([self.stats[f"{c}_max"][full][count > 0], values])
+            result[c] = {
+                "mean": float(weighted / total) if total else float("nan"),
+                "peak": float(peaks.max()) if total else float("nan"),
+            }
+
+        if impulse:
+            data = self.time_range(columns + [time_column], start, stop, time_column)
+            t_s = data[time_column] / 1000.0
+            for c in columns:
+                result[c]["impulse"] = float(np.trapezoid(np.nan_to_num(data[c]), t_s)) if len(t_s) > 1 else 0.0
+        return result
+
+def main(csv_path="data_converted.csv", out_path=None, block_rows=BLOCK_ROWS):
+    return export_csv(csv_path, out_path, block_rows)
+
+if __name__ == "__main__":
+    main()
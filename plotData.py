@@ -1,13 +1,44 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from scipy.signal import savgol_filter, butter, filtfilt
-from scipy.stats import zscore
+import json
+
+# Parameters of the filter chain in plot_voltage_data; analysis reports can override them
+FILTER_DEFAULTS = {
+    "hampel_window": 5,
+    "hampel_sigmas": 3,
+    "savgol_window": 7,
+    "savgol_polyorder": 2,
+    "ema_alpha": 0.2,
+    "butter_order": 2,
+    "butter_wn": 0.1,
+}
+
+def load_filter_params(filter_params=None, fs_hz=None):
+    """Merge FILTER_DEFAULTS with a dict or a JSON file (a spectral analysis report or a plain dict).
+
+    Reports hold one filter set per sample rate; with fs_hz the closest rate is used.
+    """
+    params = dict(FILTER_DEFAULTS)
+    if isinstance(filter_params, str):
+        with open(filter_params) as f:
+            report = json.load(f)
+        filter_params = report.get("filters", report)
+        groups = report.get("filter_groups") or []
+        if fs_hz and groups:
+            ratio = lambda g: max(g["fs_hz"] / fs_hz, fs_hz / g["fs_hz"])
+            group = min(groups, key=ratio)
+            filter_params = group["filters"]
+            if ratio(group) > 1.05:
+                print(f" WARNING: data is at {fs_hz:.4g} Hz but the closest filters in the report "
+                      f"are for {group['fs_hz']:.4g} Hz")
+    if filter_params:
+        params.update({k: v for k, v in filter_params.items() if k in FILTER_DEFAULTS})
+    return params
 
 def hampel_filter(series, window_size=5, n_sigmas=3):
     """
     Hampel filter: replaces outliers in a sliding window with the window median.
     """
+    import numpy as np
+
     new_series = series.copy()
     k = 1.4826  # scale factor for Gaussian
     L = len(series)
@@ -19,8 +50,19 @@ def hampel_filter(series, window_size=5, n_sigmas=3):
             new_series.iat[i] = med
     return new_series
 
-def plot_voltage_data(file_path):
+def plot_voltage_data(file_path, filter_params=None):
+    import pandas as pd
+    import numpy as np
+    import matplotlib.pyplot as plt
+    from scipy.signal import savgol_filter, butter, filtfilt
+    from scipy.stats import zscore
+
     df = pd.read_csv(file_path)
+    fs_hz = None
+    if "DeviceTime_ms" in df.columns:
+        median_step = df["DeviceTime_ms"].diff().median()
+        fs_hz = 1000.0 / median_step if median_step > 0 else None
+    params = load_filter_params(filter_params, fs_hz)
     required = {"Index", "V1", "V2", "V3", "V4"}
     if not required.issubset(df.columns):
         raise ValueError(f"CSV must contain columns: {required}")
@@ -33,21 +75,22 @@ def plot_voltage_data(file_path):
 
     # 2) Hampel filter
     for c in cols:
-        df_f[c] = hampel_filter(df_f[c], window_size=5, n_sigmas=3)
+        df_f[c] = hampel_filter(df_f[c], window_size=params["hampel_window"], n_sigmas=params["hampel_sigmas"])
 
     # 3) Savitzky–Golay smoothing (must fill NaNs first):
     for c in cols:
         # interpolate nearest neighbor, then back/forward-fill edges
         filled = df_f[c].interpolate(method="nearest").bfill().ffill()
-        df_f[c] = savgol_filter(filled, window_length=7, polyorder=2, mode="mirror")
+        df_f[c] = savgol_filter(filled, window_length=params["savgol_window"],
+                                polyorder=params["savgol_polyorder"], mode="mirror")
 
     # 4) Exponential moving average
-    alpha = 0.2
+    alpha = params["ema_alpha"]
     for c in cols:
         df_f[c] = pd.Series(df_f[c]).ewm(alpha=alpha).mean().values
 
     # 5) Butterworth low-pass filter
-    b, a = butter(N=2, Wn=0.1, btype="low")
+    b, a = butter(N=params["butter_order"], Wn=params["butter_wn"], btype="low")
     for c in cols:
         df_f[c] = filtfilt(b, a, df_f[c])
 
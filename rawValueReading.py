@@ -3,14 +3,6 @@ import csv
 import sys
 import glob
 import threading
-from datetime import datetime
-
-# pip install pyserial
-try:
-    import serial
-except ImportError:
-    print("This script requires pyserial. Install with: pip install pyserial")
-    sys.exit(1)
 
 BAUDRATE = 115200   # <-- adjust if your device uses a different baud rate
 READ_TIMEOUT = 0.2  # seconds; keeps the loop responsive to the stop signal
@@ -29,8 +21,16 @@ def find_usbmodem_port():
         sys.exit(1)
     return ports[0]
 
-def main():
-    port = find_usbmodem_port()
+def main(out_path="raw_readings.csv", port=None):
+    # pip install pyserial
+    try:
+        import serial
+    except ImportError:
+        print("This script requires pyserial. Install with: pip install pyserial")
+        sys.exit(1)
+
+    if port is None:
+        port = find_usbmodem_port()
     print(f"Opening serial port: {port} @ {BAUDRATE} baud")
 
     # Open serial
@@ -47,7 +47,7 @@ def main():
     stop_event = threading.Event()
 
     def wait_for_enter():
-        input("\nReading… Press ENTER to stop and save to raw_readings.csv\n")
+        input(f"\nReading… Press ENTER to stop and save to {out_path}\n")
         stop_event.set()
 
     stopper = threading.Thread(target=wait_for_enter, daemon=True)
@@ -84,7 +84,6 @@ def main():
 
     # Write CSV
     if readings:
-        out_path = "raw_readings.csv"
         try:
             with open(out_path, "w", newline="") as f:
                 writer = csv.writer(f)
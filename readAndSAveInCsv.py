@@ -1,38 +1,45 @@
-import serial
 import re
-import time
 import threading
 import csv
 import glob
 import sys
 import os
-import numpy as np
+
+CALIBRATION_DIR = "calibrationWeights"
+BAUDRATE = 9600
+
+pattern = re.compile(
+    r'Time:(-?\d+),V1:(-?\d+(?:\.\d+)?),V2:(-?\d+(?:\.\d+)?),'
+    r'V3:(-?\d+(?:\.\d+)?),V4:(-?\d+(?:\.\d+)?)'
+)
 
 # --- Load calibration functions (quadratic fit) ---
-calibration_dir = "calibrationWeights"
-conversion_functions = {}
-
-for filename in os.listdir(calibration_dir):
-    match = re.search(r'(V\d)', filename)
-    if not match:
-        continue
-
-    sensor = match.group(1)
-    forces = []
-    raw_means = []
-
-    filepath = os.path.join(calibration_dir, filename)
-    with open(filepath, newline='') as f:
-        reader = csv.reader(f)
-        next(reader)  # Skip header
-        for row in reader:
-            forces.append(float(row[0]))
-            raw_means.append(float(row[1]))
-
-    # Fit a quadratic curve: force = a*raw^2 + b*raw + c
-    a, b, c = np.polyfit(raw_means, forces, 2)
-    conversion_functions[sensor] = (a, b, c)
-    print(f"{sensor} calibration (quad): F = {a:.6e}·Raw² + {b:.6f}·Raw + {c:.6f}")
+def load_calibration(calibration_dir=CALIBRATION_DIR):
+    import numpy as np
+
+    conversion_functions = {}
+    for filename in os.listdir(calibration_dir):
+        match = re.search(r'(V\d)', filename)
+        if not match:
+            continue
+
+        sensor = match.group(1)
+        forces = []
+        raw_means = []
+
+        filepath = os.path.join(calibration_dir, filename)
+        with open(filepath, newline='') as f:
+            reader = csv.reader(f)
+            next(reader)  # Skip header
+            for row in reader:
+                forces.append(float(row[0]))
+                raw_means.append(float(row[1]))
+
+        # Fit a quadratic curve: force = a*raw^2 + b*raw + c
+        a, b, c = np.polyfit(raw_means, forces, 2)
+        conversion_functions[sensor] = (a, b, c)
+        print(f"{sensor} calibration (quad): F = {a:.6e}·Raw² + {b:.6f}·Raw + {c:.6f}")
+    return conversion_functions
 
 # --- Find USB modem port ---
 def find_usbmodem_port():
@@ -43,34 +50,27 @@ def find_usbmodem_port():
     print("connected to:", ports[0])
     return ports[0]
 
-port_name = find_usbmodem_port()
-
-ser = serial.Serial(
-    port=port_name,
-    baudrate=9600,
-    parity=serial.PARITY_NONE,
-    stopbits=serial.STOPBITS_ONE,
-    bytesize=serial.EIGHTBITS,
-    timeout=1
-)
-
-# --- Shared state ---
-buffer_lock = threading.Lock()
-data_buffer = []
-stop_event = threading.Event()
+def open_serial(port_name=None, baudrate=BAUDRATE):
+    import serial
+
+    if port_name is None:
+        port_name = find_usbmodem_port()
+    return serial.Serial(
+        port=port_name,
+        baudrate=baudrate,
+        parity=serial.PARITY_NONE,
+        stopbits=serial.STOPBITS_ONE,
+        bytesize=serial.EIGHTBITS,
+        timeout=1
+    )
 
-# --- Data reader thread ---
-def read_data():
+# --- Data reader (run in a thread) ---
+def read_data(ser, conversion_functions, data_buffer, buffer_lock, stop_event):
     index = 0
     prev_time = None
     prev_values = None
     skipped_counter = 0
 
-    pattern = re.compile(
-        r'Time:(-?\d+),V1:(-?\d+(?:\.\d+)?),V2:(-?\d+(?:\.\d+)?),'
-        r'V3:(-?\d+(?:\.\d+)?),V4:(-?\d+(?:\.\d+)?)'
-    )
-
     while not stop_event.is_set():
         try:
             line = ser.readline().decode('utf-8', errors='ignore').strip()
@@ -131,7 +131,7 @@ def read_data():
             break
 
 # --- Save data to CSV (unchanged) ---
-def save_to_csv(filename="data_converted.csv"):
+def save_to_csv(data_buffer, buffer_lock, filename="data_converted.csv"):
     with buffer_lock:
         with open(filename, 'w', newline='') as f:
             writer = csv.writer(f)
@@ -139,9 +139,20 @@ def save_to_csv(filename="data_converted.csv"):
             writer.writerows(data_buffer)
     print(f"Data saved to {filename}")
 
-# --- Main Execution ---
-if __name__ == "__main__":
-    reading_thread = threading.Thread(target=read_data, daemon=True)
+def main(filename="data_converted.csv", calibration_dir=CALIBRATION_DIR, port_name=None):
+    conversion_functions = load_calibration(calibration_dir)
+    ser = open_serial(port_name)
+
+    # --- Shared state ---
+    buffer_lock = threading.Lock()
+    data_buffer = []
+    stop_event = threading.Event()
+
+    reading_thread = threading.Thread(
+        target=read_data,
+        args=(ser, conversion_functions, data_buffer, buffer_lock, stop_event),
+        daemon=True
+    )
     reading_thread.start()
 
     try:
@@ -153,5 +164,9 @@ if __name__ == "__main__":
     reading_thread.join()
     ser.close()
 
-    save_to_csv()
-    print("Data collection stopped.")
\ No newline at end of file
+    save_to_csv(data_buffer, buffer_lock, filename)
+    print("Data collection stopped.")
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+import functools
+import json
+import math
+import os
+
+from plotData import FILTER_DEFAULTS
+
+CHANNELS = ["V1", "V2", "V3", "V4"]
+TIME_COLUMN = "DeviceTime_ms"
+CHUNK_ROWS = 262_144
+NPERSEG = 256
+SIGNAL_OVER_FLOOR = 10.0  # PSD must be 10 dB above the noise floor to count as signal
+SAVGOL_MIN_WINDOW = 5
+SAVGOL_MAX_WINDOW = 101
+FS_TOLERANCE = 0.05  # files whose sample rates differ by more than 5% get separate filters
+
+# --- Chunked input: recorded CSV or a directory written by columnarExport ---
+def iter_chunks(path, columns, chunk_rows=CHUNK_ROWS):
+    import numpy as np
+
+    if os.path.isdir(path):
+        from columnarExport import ColumnarRecording
+        rec = ColumnarRecording(path)
+        for start in range(0, rec.rows, chunk_rows):
+            yield {c: np.asarray(rec.column(c)[start:start + chunk_rows], dtype=np.float64) for c in columns}
+    else:
+        import pandas as pd
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunk_rows):
+            yield {c: chunk[c].to_numpy(dtype=np.float64) for c in columns}
+
+def _clean(values):
+    """Same first step as plot_voltage_data: negatives are dropped, then gaps are filled."""
+    import pandas as pd
+
+    s = pd.Series(values)
+    return s.where(s >= 0).interpolate().bfill().ffill().to_numpy()
+
+def hampel_hits(values, window_size, n_sigmas):
+    """Hits hampel_filter would replace in values[window_size:-window_size], without the Python loop."""
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    if len(values) < 2 * window_size + 1:
+        return np.zeros(0, dtype=bool)
+    windows = sliding_window_view(values, 2 * window_size + 1)
+    med = np.median(windows, axis=1)
+    mad = 1.4826 * np.median(np.abs(windows - med[:, None]), axis=1)
+    return np.abs(values[window_size:len(values) - window_size] - med) > n_sigmas * mad
+
+def _timing_stats(steps):
+    import numpy as np
+
+    if len(steps) == 0:
+        return {}
+    median = float(np.median(steps))
+    return {
+        "samples": int(len(steps) + 1),
+        "median_step_ms": median,
+        "mean_step_ms": float(steps.mean()),
+        "std_step_ms": float(steps.std()),
+        "p05_step_ms": float(np.percentile(steps, 5)),
+        "p95_step_ms": float(np.percentile(steps, 95)),
+        "min_step_ms": int(steps.min()),
+        "max_step_ms": int(steps.max()),
+        "non_increasing_steps": int(np.count_nonzero(steps <= 0)),
+        "gap_steps": int(np.count_nonzero(steps > 1.5 * median)) if median > 0 else 0,
+    }
+
+@functools.lru_cache(maxsize=None)
+def savgol_cutoff(window, polyorder):
+    """Measured -3 dB point of a Savitzky–Golay smoother, as a fraction of Nyquist."""
+    import numpy as np
+    from scipy.signal import freqz, savgol_coeffs
+
+    w, h = freqz(savgol_coeffs(window, polyorder), worN=4096)
+    below = np.flatnonzero(np.abs(h) < 1 / math.sqrt(2))
+    return float(w[below[0]] / np.pi) if len(below) else 1.0
+
+def _recommend(freqs, psd, floor, fs):
+    """Butterworth Wn and Savitzky–Golay window that keep the band where PSD stands above the floor."""
+    import numpy as np
+
+    above = np.flatnonzero(psd[1:] > floor * 10 ** (SIGNAL_OVER_FLOOR / 10)) + 1
+    f_signal = float(freqs[above[-1]]) if len(above) else float(freqs[1])
+    nyquist = fs / 2
+    wn = min(max(f_signal / nyquist, 0.01), 0.9)
+
+    # Widest window (most smoothing) whose measured cutoff still passes the signal band;
+    # the cutoff falls as the window grows, so stop at the first one that is too narrow
+    polyorder = FILTER_DEFAULTS["savgol_polyorder"]
+    window = SAVGOL_MIN_WINDOW
+    for candidate in range(SAVGOL_MIN_WINDOW + 2, SAVGOL_MAX_WINDOW + 1, 2):
+        if savgol_cutoff(candidate, polyorder) < f_signal / nyquist:
+            break
+        window = candidate
+    return f_signal, round(wn, 4), window
+
+# --- Per-file analysis ---
+def analyze_file(path, fs=None, nperseg=NPERSEG, chunk_rows=CHUNK_ROWS,
+                 window_size=FILTER_DEFAULTS["hampel_window"], n_sigmas=FILTER_DEFAULTS["hampel_sigmas"]):
+    import numpy as np
+    from scipy.signal import welch
+
+    columns = [TIME_COLUMN] + CHANNELS
+    psd_sum = {c: None for c in CHANNELS}
+    psd_weight = 0
+    hits = {c: 0 for c in CHANNELS}
+    steps = []
+    n_rows = 0
+    prev_time = None
+    t_min, t_max = math.inf, -math.inf
+    carry = None  # last 2·window_size rows, so Hampel windows span chunk boundaries
+    freqs = None
+
+    for chunk in iter_chunks(path, columns, chunk_rows):
+        t = chunk[TIME_COLUMN]
+        if len(t) == 0:
+            continue
+        step = np.diff(t if prev_time is None else np.concatenate([[prev_time], t]))
+        steps.append(step.astype(np.int32))
+        prev_time = t[-1]
+        t_min, t_max = min(t_min, float(t.min())), max(t_max, float(t.max()))
+
+        if fs is None:
+            median_step = float(np.median(step)) if len(step) else 0.0
+            if median_step <= 0:
+                raise ValueError(f"{path}: cannot infer the sample rate from {TIME_COLUMN}, pass fs")
+            fs = 1000.0 / median_step
+
+        cleaned = {c: _clean(chunk[c]) for c in CHANNELS}
+
+        # Welch PSD per chunk, averaged over chunks weighted by their segment count
+        if len(t) >= nperseg:
+            segments = (len(t) - nperseg) // (nperseg // 2) + 1
+            for c in CHANNELS:
+                freqs, psd = welch(cleaned[c], fs=fs, nperseg=nperseg)
+                psd_sum[c] = psd * segments if psd_sum[c] is None else psd_sum[c] + psd * segments
+            psd_weight += segments
+
+        # Hampel hits: a sample is scored once its whole window has been seen
+        bufs = cleaned if carry is None else {c: np.concatenate([carry[c], cleaned[c]]) for c in CHANNELS}
+        for c in CHANNELS:
+            hits[c] += int(np.count_nonzero(hampel_hits(bufs[c], window_size, n_sigmas)))
+        carry = {c: bufs[c][-2 * window_size:] for c in CHANNELS}
+        n_rows += len(t)
+
+    if n_rows == 0:
+        raise ValueError(f"{path} has no rows to analyze")
+
+    steps = np.concatenate(steps)
+    # Span covered by the device clock, gaps included. Equals the sum of positive steps
+    # when time only moves forward, without counting jitter that steps back and forth;
+    # rows / fs is only an estimate, kept for recordings whose timestamps do not move
+    elapsed_ms = t_max - t_min
+    duration_s = elapsed_ms / 1000.0 if elapsed_ms > 0 else n_rows / fs
+    report = {"rows": n_rows, "fs_hz": round(fs, 4), "duration_s": round(duration_s, 3),
+              "timing": _timing_stats(steps), "channels": {}}
+
+    for c in CHANNELS:
+        channel = {"spike_rate_hz": round(hits[c] / duration_s, 4), "hampel_hits": hits[c]}
+        if psd_weight:
+            psd = psd_sum[c] / psd_weight
+            # Noise floor: median PSD over the upper half of the band, where the board has no signal
+            floor = float(np.median(psd[freqs >= fs / 4]))
+            f_signal, wn, window = _recommend(freqs, psd, floor, fs)
+            channel.update({
+                "noise_floor": floor,
+                "noise_rms": math.sqrt(floor * fs / 2),
+                "signal_band_hz": round(f_signal, 4),
+                "peak_freq_hz": round(float(freqs[1:][np.argmax(psd[1:])]), 4),
+                "butter_wn": wn,
+                "savgol_window": window,
+                # Below signal_band_hz only when even the smallest window cuts into the band
+                "savgol_cutoff_hz": round(savgol_cutoff(window, FILTER_DEFAULTS["savgol_polyorder"]) * fs / 2, 4),
+                "psd": {"freqs_hz": freqs.round(4).tolist(), "density": psd.tolist()},
+            })
+        report["channels"][c] = channel
+    return report
+
+def recommend_filters(reports):
+    """One parameter set for the whole chain: keep the widest signal band seen on any channel.
+
+    Wn and window lengths are relative to the sample rate, so only pass reports of one rate.
+    """
+    params = dict(FILTER_DEFAULTS)
+    channels = [ch for r in reports for ch in r["channels"].values() if "butter_wn" in ch]
+    if channels:
+        params["butter_wn"] = max(ch["butter_wn"] for ch in channels)
+        params["savgol_window"] = min(ch["savgol_window"] for ch in channels)
+    return params
+
+def group_by_rate(files):
+    """Filter recommendations per sample rate: files within FS_TOLERANCE of each other share one set."""
+    groups = []
+    for path, report in sorted(files.items(), key=lambda item: item[1]["fs_hz"]):
+        if groups and report["fs_hz"] <= groups[-1]["fs_hz"] * (1 + FS_TOLERANCE):
+            groups[-1]["files"].append(path)
+        else:
+            groups.append({"fs_hz": report["fs_hz"], "files": [path]})
+    for group in groups:
+        group["rows"] = sum(files[p]["rows"] for p in group["files"])
+        group["filters"] = recommend_filters([files[p] for p in group["files"]])
+    return groups
+
+def _analyze_one(args):
+    path, kwargs = args
+    try:
+        return path, analyze_file(path, **kwargs), None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+def main(paths=("data_converted.csv",), out_path="analysis_report.json", jobs=None, include_psd=False, **kwargs):
+    from concurrent.futures import ProcessPoolExecutor
+
+    paths = list(paths)
+    jobs = jobs or min(len(paths), os.cpu_count() or 1)
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_analyze_one, [(p, kwargs) for p in paths]))
+    else:
+        results = [_analyze_one((p, kwargs)) for p in paths]
+
+    files = {}
+    for path, report, error in results:
+        if error:
+            print(f"{path}: {error}")
+            files[path] = {"error": error}
+            continue
+        if not include_psd:
+            for channel in report["channels"].values():
+                channel.pop("psd", None)
+        files[path] = report
+
+        timing = report["timing"]
+        print(f"{path}: {report['rows']} rows @ {report['fs_hz']} Hz, step {timing.get('median_step_ms')} ms "
+              f"(std {timing.get('std_step_ms', 0):.2f}, {timing.get('non_increasing_steps', 0)} non-increasing)")
+        for c, ch in report["channels"].items():
+            print(f"  {c}: spikes {ch['spike_rate_hz']}/s  floor {ch.get('noise_floor', float('nan')):.4g}  "
+                  f"band {ch.get('signal_band_hz')} Hz  Wn {ch.get('butter_wn')}  savgol {ch.get('savgol_window')}")
+
+    groups = group_by_rate({p: r for p, r in files.items() if "error" not in r})
+    if len(groups) > 1:
+        print(f"WARNING: files were recorded at {len(groups)} different sample rates, "
+              f"filters are recommended per rate (see filter_groups in the report)")
+        for group in groups:
+            print(f"  {group['fs_hz']} Hz: {group['filters']}  <- {', '.join(group['files'])}")
+
+    # Top-level filters (what plot --filters falls back to) come from the rate with the most data
+    main_group = max(groups, key=lambda g: g["rows"]) if groups else {"fs_hz": None, "filters": dict(FILTER_DEFAULTS)}
+    with open(out_path, "w") as f:
+        json.dump({"files": files, "fs_hz": main_group["fs_hz"], "filters": main_group["filters"],
+                   "filter_groups": groups}, f, indent=2)
+    print(f"Recommended filters for {main_group['fs_hz']} Hz: {main_group['filters']}")
+    print(f"Report saved to {out_path}")
+    return main_group["filters"]
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import argparse
+import sys
+
+# Every subcommand imports its own script inside the handler, so `wiiboard.py --help`
+# and argument errors never pay for numpy/scipy/pandas/matplotlib/pyserial.
+
+def cmd_record(args):
+    from readAndSAveInCsv import main
+    main(filename=args.output, calibration_dir=args.calibration_dir, port_name=args.port)
+
+def cmd_raw(args):
+    from rawValueReading import main
+    main(out_path=args.output, port=args.port)
+
+def cmd_live(args):
+    from readAndObserveRealTime import main
+    main(calibration_dir=args.calibration_dir, port_name=args.port)
+
+def cmd_plot(args):
+    from plotData import plot_voltage_data
+    plot_voltage_data(args.file, args.filters)
+
+def cmd_calibrate(args):
+    from calibration import main
+    main(calibration_dir=args.calibration_dir, plot=not args.no_plot)
+
+def cmd_export(args):
+    from columnarExport import export_csv
+    export_csv(args.file, args.output, args.block_rows)
+
+def cmd_query(args):
+    from columnarExport import ColumnarRecording
+    rec = ColumnarRecording(args.path)
+    if args.threshold is not None:
+        rows = rec.above(args.column, args.threshold, ["Index", args.column])
+        print(f"{len(rows['Index'])} rows with {args.column} > {args.threshold}")
+        for index, value in zip(rows["Index"][:args.limit], rows[args.column][:args.limit]):
+            print(index, value)
+    else:
+        for column, stats in rec.summary(args.start, args.stop).items():
+            print(f"{column}: mean={stats['mean']:.3f} N  peak={stats['peak']:.3f} N  impulse={stats['impulse']:.3f} N·s")
+
+def cmd_analyze(args):
+    from spectralAnalysis import main
+    main(args.files, out_path=args.output, jobs=args.jobs, include_psd=args.psd, fs=args.fs)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="wiiboard", description="Wii board acquisition and analysis tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("record", help="read calibrated forces and save them to a CSV")
+    p.add_argument("-o", "--output", default="data_converted.csv")
+    p.add_argument("--calibration-dir", default="calibrationWeights")
+    p.add_argument("--port", default=None, help="serial port (default: first /dev/tty.usbmodem*)")
+    p.set_defaults(func=cmd_record)
+
+    p = sub.add_parser("raw", help="read raw sensor values and save them to a CSV")
+    p.add_argument("-o", "--output", default="raw_readings.csv")
+    p.add_argument("--port", default=None, help="serial port (default: first /dev/tty.usbmodem*)")
+    p.set_defaults(func=cmd_raw)
+
+    p = sub.add_parser("live", help="plot calibrated forces in real time")
+    p.add_argument("--calibration-dir", default="calibrationWeights")
+    p.add_argument("--port", default=None, help="serial port (default: first /dev/tty.usbmodem*)")
+    p.set_defaults(func=cmd_live)
+
+    p = sub.add_parser("plot", help="filter and plot a recorded CSV")
+    p.add_argument("file", nargs="?", default="data_converted.csv")
+    p.add_argument("--filters", default=None, help="JSON with filter parameters, e.g. an analyze report")
+    p.set_defaults(func=cmd_plot)
+
+    p = sub.add_parser("calibrate", help="fit and plot the calibration curves")
+    p.add_argument("--calibration-dir", default="calibrationWeights")
+    p.add_argument("--no-plot", action="store_true", help="only print the fitted coefficients")
+    p.set_defaults(func=cmd_calibrate)
+
+    p = sub.add_parser("export", help="convert a recorded CSV to the columnar format used by query")
+    p.add_argument("file", nargs="?", default="data_converted.csv")
+    p.add_argument("-o", "--output", default=None, help="output directory (default: <file>.cols)")
+    p.add_argument("--block-rows", type=int, default=65536)
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("query", help="per-trial mean/peak/impulse or threshold rows from an export")
+    p.add_argument("path", help="directory written by export")
+    p.add_argument("--start", type=float, default=None, help="trial start, device time in ms")
+    p.add_argument("--stop", type=float, default=None, help="trial end, device time in ms")
+    p.add_argument("--column", default="V1", help="column for --threshold")
+    p.add_argument("--threshold", type=float, default=None, help="list rows where column > threshold")
+    p.add_argument("--limit", type=int, default=20, help="rows to print for --threshold")
+    p.set_defaults(func=cmd_query)
+
+    p = sub.add_parser("analyze", help="PSD, noise floor, spike rate and timing jitter of recordings")
+    p.add_argument("files", nargs="*", default=["data_converted.csv"], help="CSV files or export directories")
+    p.add_argument("-o", "--output", default="analysis_report.json")
+    p.add_argument("-j", "--jobs", type=int, default=None, help="files analyzed in parallel (default: one per CPU)")
+    p.add_argument("--fs", type=float, default=None, help="sample rate in Hz (default: from DeviceTime_ms)")
+    p.add_argument("--psd", action="store_true", help="include the full PSDs in the report")
+    p.set_defaults(func=cmd_analyze)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])